@@ -0,0 +1,178 @@
+// Client-side playback of sorting traces shipped once into a dcc.Store.
+// Trace payloads come from Trace.to_dict() in sorting/trace.py.  Payloads with a
+// ``cost`` array (race mode) are played on a shared cost clock instead of by frame.
+// Payloads marked ``binary`` carry their arrays as base64 typed arrays (sorting/wire.py).
+(function () {
+    var SWAP = 1;  // WRITE is the only other mutating op
+    // Arrays longer than LARGE_ARRAY_SIZE are binned into min/max envelopes and drawn with WebGL
+    var LARGE_ARRAY_SIZE = 2000;
+    var RENDER_BUCKETS = 1000;
+    // Longer traces skip frames so that playing one never takes more ticks than this
+    var MAX_TICKS = 2000;
+    var DTYPES = {u1: Uint8Array, u2: Uint16Array, u4: Uint32Array, i4: Int32Array, f8: Float64Array};
+    var ARRAY_FIELDS = ['initial', 'ops', 'a', 'b', 'cost'];
+    var cursors = new WeakMap();
+    var decoded = new WeakMap();
+
+    function decodeArray(field) {
+        // Typed arrays use the platform byte order, which is little-endian in every browser we target
+        var bytes = atob(field.data);
+        var buffer = new Uint8Array(bytes.length);
+        for (var i = 0; i < bytes.length; i++) {
+            buffer[i] = bytes.charCodeAt(i);
+        }
+        return Array.from(new DTYPES[field.dtype](buffer.buffer));
+    }
+
+    function decode(trace) {
+        // Decoded once per payload, so cursors keep working across ticks
+        if (!trace || !trace.binary) {
+            return trace;
+        }
+        var result = decoded.get(trace);
+        if (!result) {
+            result = Object.assign({}, trace);
+            ARRAY_FIELDS.forEach(function (name) {
+                if (trace[name]) {
+                    result[name] = decodeArray(trace[name]);
+                }
+            });
+            decoded.set(trace, result);
+        }
+        return result;
+    }
+
+    function flatten(stores) {
+        return [].concat.apply([], stores.map(function (s) { return Array.isArray(s) ? s : [s]; })).map(decode);
+    }
+
+    function frameCount(trace) {
+        return trace ? trace.ops.length + 1 : 1;
+    }
+
+    function framesReached(cost, clock) {
+        // Frames whose cumulative cost fits within clock, i.e. searchsorted(cost, clock, 'right')
+        var lo = 0, hi = cost.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (cost[mid] <= clock) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        return lo;
+    }
+
+    function cursorFor(trace, k) {
+        var cursor = cursors.get(trace);
+        if (!cursor || cursor.frame > k) {
+            var x = cursor ? cursor.x : trace.initial.map(function (_, i) { return i + 1; });
+            cursor = {frame: 0, arr: trace.initial.slice(), x: x};
+            cursors.set(trace, cursor);
+        }
+        var arr = cursor.arr;
+        for (var t = cursor.frame; t < k; t++) {
+            var i = trace.a[t], j = trace.b[t];
+            if (trace.ops[t] === SWAP) {
+                var tmp = arr[i];
+                arr[i] = arr[j];
+                arr[j] = tmp;
+            } else {
+                arr[i] = j;
+            }
+        }
+        cursor.frame = k;
+        return cursor;
+    }
+
+    function minmaxTrace(arr) {
+        // One vertical min-max segment per bucket, separated by gaps
+        var width = Math.ceil(arr.length / RENDER_BUCKETS);
+        var x = [], y = [];
+        for (var start = 0; start < arr.length; start += width) {
+            var end = Math.min(start + width, arr.length);
+            var lo = arr[start], hi = arr[start];
+            for (var i = start + 1; i < end; i++) {
+                if (arr[i] < lo) lo = arr[i];
+                if (arr[i] > hi) hi = arr[i];
+            }
+            x.push(start + 1, start + 1, null);
+            y.push(lo, hi, null);
+        }
+        return {type: 'scattergl', mode: 'lines', x: x, y: y, line: {color: 'blue', width: 2}, hoverinfo: 'skip'};
+    }
+
+    function figure(trace, position) {
+        if (!trace) {
+            return {data: [], layout: {}};
+        }
+        var frame = trace.cost ? framesReached(trace.cost, position) : position;
+        var cursor = cursorFor(trace, Math.min(frame, frameCount(trace) - 1));
+        var title = trace.name || '';
+        if (trace.cost) {
+            title += ' (cost ' + Math.min(position, trace.total_cost) + ' / ' + trace.total_cost
+                + (position >= trace.total_cost ? ', finished)' : ')');
+        }
+        var data = cursor.arr.length > LARGE_ARRAY_SIZE
+            ? minmaxTrace(cursor.arr)
+            : {type: 'bar', x: cursor.x, y: cursor.arr.slice(), marker: {color: 'blue'}};
+        return {
+            data: [data],
+            layout: {
+                title: {text: title},
+                xaxis: {title: {text: 'Index'}},
+                yaxis: {title: {text: 'Value'}}
+            }
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        playback: {
+            // (n_intervals, step_clicks, play_clicks, ...trace stores, position, disabled)
+            advance: function () {
+                var args = Array.prototype.slice.call(arguments, 3);
+                var disabled = args.pop();
+                var position = args.pop() || 0;
+                var traces = flatten(args);
+                var last = Math.max.apply(null, traces.map(frameCount)) - 1;
+                var step = Math.max(1, Math.ceil(last / MAX_TICKS));
+                var raced = traces.filter(function (t) { return t && t.cost; });
+                if (raced.length) {
+                    // Position is the cost clock; keep the race as many ticks long as the longest trace
+                    var ticks = Math.ceil(last / step);
+                    last = Math.max.apply(null, raced.map(function (t) { return t.total_cost; }));
+                    step = Math.max(1, Math.ceil(last / Math.max(ticks, 1)));
+                }
+                var triggered = dash_clientside.callback_context.triggered.map(function (t) { return t.prop_id; });
+
+                triggered.forEach(function (prop) {
+                    if (prop.endsWith('-play.n_clicks')) {
+                        if (disabled && position >= last) {
+                            position = 0;
+                        }
+                        disabled = !disabled;
+                    } else if (prop.endsWith('-step.n_clicks')) {
+                        position += step;
+                        disabled = true;
+                    } else if (prop.endsWith('.n_intervals')) {
+                        position += step;
+                    } else if (prop.endsWith('.data')) {
+                        position = 0;
+                    }
+                });
+                position = Math.min(position, last);
+                if (position >= last) {
+                    disabled = true;
+                }
+                return [position, disabled, disabled ? 'Play' : 'Pause'];
+            },
+
+            // (position, ...trace stores) -> one figure per trace
+            render: function (position) {
+                var traces = flatten(Array.prototype.slice.call(arguments, 1));
+                return traces.map(function (trace) { return figure(trace, position || 0); });
+            }
+        }
+    });
+})();
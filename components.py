@@ -0,0 +1,109 @@
+import functools
+
+import dash
+from dash import dcc, html, Input, Output, State, ClientsideFunction
+import dash_bootstrap_components as dbc
+import diskcache
+import plotly.graph_objs as go
+
+from sorting import complexity
+from sorting.cache import cache_dir
+from sorting.bench import format_bytes
+
+# Playback speeds in frames per second, selected by slider index
+SPEEDS = [1, 2, 5, 10, 30, 60]
+
+
+def playback_controls(prefix):
+    return html.Div([
+        dbc.ButtonGroup([
+            dbc.Button('Pause', id=f'{prefix}-play', color='primary'),
+            dbc.Button('Step', id=f'{prefix}-step', color='secondary'),
+        ]),
+        html.Div(
+            dcc.Slider(
+                id=f'{prefix}-speed',
+                min=0,
+                max=len(SPEEDS) - 1,
+                step=1,
+                value=0,
+                marks={i: f'{fps} fps' for i, fps in enumerate(SPEEDS)}
+            ),
+            style={'flex': 1}
+        ),
+        dcc.Interval(id=f'{prefix}-interval', interval=1000, n_intervals=0),
+        dcc.Store(id=f'{prefix}-position', data=0),
+    ], className='d-flex align-items-center gap-3 my-2')
+
+
+def register_playback(prefix, trace_ids, graph_ids):
+    # Frames are replayed in the browser; the server only fills the trace stores
+    dash.clientside_callback(
+        ClientsideFunction('playback', 'advance'),
+        output=[
+            Output(f'{prefix}-position', 'data'),
+            Output(f'{prefix}-interval', 'disabled'),
+            Output(f'{prefix}-play', 'children'),
+        ],
+        inputs=[
+            Input(f'{prefix}-interval', 'n_intervals'),
+            Input(f'{prefix}-step', 'n_clicks'),
+            Input(f'{prefix}-play', 'n_clicks'),
+        ] + [Input(trace_id, 'data') for trace_id in trace_ids],
+        state=[
+            State(f'{prefix}-position', 'data'),
+            State(f'{prefix}-interval', 'disabled'),
+        ],
+    )
+    dash.clientside_callback(
+        ClientsideFunction('playback', 'render'),
+        output=[Output(graph_id, 'figure') for graph_id in graph_ids],
+        inputs=[Input(f'{prefix}-position', 'data')] + [Input(trace_id, 'data') for trace_id in trace_ids],
+    )
+    dash.clientside_callback(
+        f'function(i) {{ return 1000 / {SPEEDS}[i]; }}',
+        Output(f'{prefix}-interval', 'interval'),
+        Input(f'{prefix}-speed', 'value'),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def uncached_manager():
+    """Background-callback manager that hands each result over once instead of caching it.
+
+    The app's manager keeps every result for an hour keyed by the inputs,
+    so a job timeout returned as output would be replayed to everyone
+    asking for the same inputs.
+    """
+    return dash.DiskcacheManager(diskcache.Cache(cache_dir('callbacks')))
+
+
+def complexity_figure(curve):
+    # Measured curves from sorting.complexity, on log-log axes so the slope is the exponent
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=curve['sizes'], y=curve['comparisons'], mode='lines+markers', name='Comparisons'))
+    fig.add_trace(go.Scatter(x=curve['sizes'], y=[t / 1e6 for t in curve['time_ns']], mode='lines+markers', name='Time (ms)', yaxis='y2'))
+    fig.update_layout(
+        title=f"{curve['algorithm']}: comparisons ~ n^{curve['comparison_exponent']:.2f}, time ~ n^{curve['time_exponent']:.2f}",
+        xaxis=dict(title='Input Size (n)', type='log'),
+        yaxis=dict(title='Comparisons', type='log'),
+        yaxis2=dict(title='Time (ms)', type='log', overlaying='y', side='right'),
+        legend=dict(x=0, y=1),
+    )
+    return fig
+
+
+@functools.lru_cache(maxsize=1)
+def complexity_figures():
+    """Complexity figures for every algorithm, built once per process as plain dicts."""
+    return {name: complexity_figure(curve).to_plotly_json() for name, curve in complexity.curves().items()}
+
+
+def cost_summary(record):
+    """One line of a bench.cost record, shown under a graph."""
+    return html.Small(
+        f"{record['comparisons']:,} comparisons · {record['swaps']:,} swaps · {record['writes']:,} writes · "
+        f"{record['allocations']} buffers ({record['allocated_items']:,} items) · peak {format_bytes(record['peak_bytes'])}",
+        className='text-muted d-block text-center'
+    )
+
@@ -1,11 +1,19 @@
+import time
+# Taken before the heavy imports so the reported startup time covers them
+started = time.perf_counter()
+
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
-import plotly.graph_objs as go
-import time
-import random
 import dash_bootstrap_components as dbc
-import copy
+import diskcache
+import flask
+
+from metrics import instrument
+from sorting.algorithms import engine_version, get_algorithm, record
+from sorting.cache import TraceCache, cache_dir
+from sorting.datasets import generate
+from sorting.stream import frame_events
+from sorting.trace import TraceTooLong
 
 cards = dbc.Row([
     dbc.Col(
@@ -38,18 +46,90 @@ navbar=dbc.NavbarSimple(
     fluid=True
 )
 
-app = dash.Dash(__name__, pages_folder='pages', use_pages=True, external_stylesheets=[dbc.themes.BOOTSTRAP])
-
-app.layout = html.Div([
-    navbar,
-    html.Br(),
-    #cards,
-    html.Div(children=[
-        dcc.Link(page['name'], href=page["relative_path"], className="btn btn-dark m-2 fs-5")\
-            for page in dash.page_registry.values()
-    ]),
-    dash.page_container,
-])
+MAX_STREAM_SIZE = 100000
+MAX_STREAM_FPS = 240
+# Streams are recorded on a request thread, so longer traces are refused
+MAX_STREAM_OPS = 5_000_000
+# Frame stores of streams up to this size are kept in memory; larger ones are
+# written once to disk and mapped, so every server worker shares them
+MEMORY_STREAM_SIZE = 1000
+
+# Streams run in the server process, so their frame stores stay cached between
+# requests, e.g. for a reconnecting EventSource
+stream_frames = TraceCache()
+_stream_store = None
+
+def stream_store():
+    # Created on first use: the frame store imports numpy, which startup does not need
+    global _stream_store
+    if _stream_store is None:
+        from sorting.tracefile import TraceStore
+        _stream_store = TraceStore()
+    return _stream_store
+
+def stream_trace(algorithm):
+    # Server-Sent Events of frame deltas, e.g. /stream/Quick%20Sort?size=100&seed=1&fps=60
+    args = flask.request.args
+    size = min(max(args.get('size', 50, type=int), 1), MAX_STREAM_SIZE)
+    fps = min(max(args.get('fps', 30, type=float), 1), MAX_STREAM_FPS)
+    distribution, seed = args.get('distribution', 'uniform'), args.get('seed', 0, type=int)
+    try:
+        get_algorithm(algorithm)
+        data = generate(distribution, size, seed)
+    except ValueError as e:
+        flask.abort(400, str(e))
+    key = (algorithm, distribution, size, seed)
+    try:
+        if size <= MEMORY_STREAM_SIZE:
+            frames = stream_frames.get(key, lambda: record(algorithm, data, MAX_STREAM_OPS).to_frames())
+        else:
+            frames = stream_store().get(key + (engine_version(),), lambda: record(algorithm, data, MAX_STREAM_OPS))
+    except TraceTooLong as e:
+        flask.abort(400, f'{algorithm} on {size:,} items: {e}')
+    # A reconnecting EventSource resumes from the last frame it received
+    start = flask.request.headers.get('Last-Event-ID', 0, type=int)
+    return flask.Response(
+        frame_events(frames, fps, start),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+def serve_layout():
+    return html.Div([
+        navbar,
+        html.Br(),
+        #cards,
+        html.Div(children=[
+            dcc.Link(page['name'], href=page["relative_path"], className="btn btn-dark m-2 fs-5")\
+                for page in dash.page_registry.values()
+        ]),
+        dash.page_container,
+    ])
+
+def create_app():
+    # Background callbacks run in their own processes; results are cached on disk
+    # until any sorting algorithm changes
+    background_callback_manager = dash.DiskcacheManager(
+        diskcache.Cache(cache_dir('callbacks')),
+        cache_by=[engine_version],
+        expire=60 * 60,
+    )
+
+    # Every module in pages/ is a page; layouts are functions built per request
+    app = dash.Dash(__name__, pages_folder='pages', use_pages=True, external_stylesheets=[dbc.themes.BOOTSTRAP],
+                    background_callback_manager=background_callback_manager)
+    app.layout = serve_layout
+
+    # Per-callback latency, payload size and errors at /metrics
+    metrics = instrument(app)
+    app.server.add_url_rule('/stream/<algorithm>', view_func=stream_trace)
+
+    metrics.startup_seconds = time.perf_counter() - started
+    app.logger.info('Ready in %.0f ms', metrics.startup_seconds * 1000)
+    return app
+
+app = create_app()
+server = app.server
 
 if __name__ == '__main__':
     app.run_server(debug=True)
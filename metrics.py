@@ -0,0 +1,123 @@
+import bisect
+import threading
+import time
+
+import flask
+
+# Histogram bucket upper bounds, in seconds and in bytes (256 B to 16 MB)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(9))
+
+CALLBACK_PATH = '/_dash-update-component'
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {total}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {total}'
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class CallbackMetrics:
+    """Per-callback latency, response size and error counts, keyed by the callback's output id."""
+
+    def __init__(self):
+        self.latency = {}
+        self.size = {}
+        self.errors = {}
+        # Set by the app once it can serve requests
+        self.startup_seconds = None
+        self.lock = threading.Lock()
+
+    def observe(self, callback, seconds, nbytes, error=False):
+        with self.lock:
+            if callback not in self.latency:
+                self.latency[callback] = Histogram(LATENCY_BUCKETS)
+                self.size[callback] = Histogram(SIZE_BUCKETS)
+                self.errors[callback] = 0
+            self.latency[callback].observe(seconds)
+            self.size[callback].observe(nbytes)
+            self.errors[callback] += error
+
+    def render(self):
+        """The metrics in Prometheus text exposition format."""
+        with self.lock:
+            lines = [
+                '# HELP dash_callback_duration_seconds Server time spent handling a callback request.',
+                '# TYPE dash_callback_duration_seconds histogram',
+            ]
+            for callback, histogram in sorted(self.latency.items()):
+                lines.extend(histogram.lines('dash_callback_duration_seconds', f'callback="{_label(callback)}"'))
+            lines += [
+                '# HELP dash_callback_response_bytes Size of callback response bodies.',
+                '# TYPE dash_callback_response_bytes histogram',
+            ]
+            for callback, histogram in sorted(self.size.items()):
+                lines.extend(histogram.lines('dash_callback_response_bytes', f'callback="{_label(callback)}"'))
+            lines += [
+                '# HELP dash_callback_errors_total Callback requests that returned an error status.',
+                '# TYPE dash_callback_errors_total counter',
+            ]
+            for callback, errors in sorted(self.errors.items()):
+                lines.append(f'dash_callback_errors_total{{callback="{_label(callback)}"}} {errors}')
+            if self.startup_seconds is not None:
+                lines += [
+                    '# HELP dash_app_startup_seconds Time from importing the app to being ready to serve.',
+                    '# TYPE dash_app_startup_seconds gauge',
+                    f'dash_app_startup_seconds {self.startup_seconds}',
+                ]
+        return '\n'.join(lines) + '\n'
+
+
+def instrument(app, metrics=None, path='/metrics'):
+    """Time every callback request of the Dash ``app`` and serve the results at ``path``.
+
+    Hooks run once per callback request, so the cost is a clock read and a
+    locked dict update.  Background callbacks are recorded per poll.
+    """
+    metrics = metrics or CallbackMetrics()
+    server = app.server
+
+    @server.before_request
+    def start_timer():
+        if flask.request.path.endswith(CALLBACK_PATH):
+            flask.g.callback_start = time.perf_counter()
+
+    @server.after_request
+    def record(response):
+        start = flask.g.pop('callback_start', None)
+        if start is not None:
+            body = flask.request.get_json(silent=True) or {}
+            callback = body.get('output')
+            # Ids come from the client, so unregistered ones share a label
+            if callback not in app.callback_map:
+                callback = 'unknown'
+            metrics.observe(
+                callback,
+                time.perf_counter() - start,
+                response.calculate_content_length() or 0,
+                response.status_code >= 400,
+            )
+        return response
+
+    @server.route(path)
+    def prometheus_metrics():
+        return flask.Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    return metrics
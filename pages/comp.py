@@ -1,194 +1,230 @@
 import dash
-from dash import dcc, html, Input, Output, callback
-import plotly.graph_objs as go
+from dash import dcc, html, Input, Output, State, callback
 import random
-import time
 import dash_bootstrap_components as dbc
-
-
-# Sorting algorithms
-def bubble_sort(arr):
-    n = len(arr)
-    states = [arr.copy()]
-    for i in range(n - 1):
-        for j in range(0, n - i - 1):
-            if arr[j] > arr[j + 1]:
-                arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                states.append(arr.copy())  
-    return states
-
-def selection_sort(arr):
-    n = len(arr)
-    states = [arr.copy()]
-    for i in range(n):
-        min_idx = i
-        for j in range(i + 1, n):
-            if arr[j] < arr[min_idx]:
-                min_idx = j
-        arr[i], arr[min_idx] = arr[min_idx], arr[i]
-        states.append(arr.copy()) 
-    return states
-
-def insertion_sort(arr):
-    states = [arr.copy()]
-    for i in range(1, len(arr)):
-        key = arr[i]
-        j = i - 1
-        while j >= 0 and key < arr[j]:
-            arr[j + 1] = arr[j]
-            j -= 1
-        arr[j + 1] = key
-        states.append(arr.copy()) 
-    return states
-
-def merge_sort(arr):
-    states = []
-    
-    def merge_sort_helper(arr):
-        if len(arr) <= 1:
-            return arr
-        mid = len(arr) // 2
-        left = merge_sort_helper(arr[:mid])
-        right = merge_sort_helper(arr[mid:])
-        
-        return merge(left, right)
-    
-    def merge(left, right):
-        merged = []
-        i = j = 0
-        while i < len(left) and j < len(right):
-            if left[i] < right[j]:
-                merged.append(left[i])
-                i += 1
-            else:
-                merged.append(right[j])
-                j += 1
-        merged.extend(left[i:])
-        merged.extend(right[j:])
-        states.append(merged.copy())  
-        return merged
-    
-    merge_sort_helper(arr)
-    return states
-
-def quick_sort(arr):
-    states = []
-    
-    def quick_sort_helper(arr, start, end):
-        if start < end:
-            pivot_index = partition(arr, start, end)
-            quick_sort_helper(arr, start, pivot_index - 1)
-            quick_sort_helper(arr, pivot_index + 1, end)
-    
-    def partition(arr, start, end):
-        pivot = arr[end]
-        i = start - 1
-        for j in range(start, end):
-            if arr[j] < pivot:
-                i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-        arr[i + 1], arr[end] = arr[end], arr[i + 1]
-        states.append(arr.copy())  
-        return i + 1
-    
-    quick_sort_helper(arr, 0, len(arr) - 1)
-    return states
-
-sorting_algorithms = {
-    'Bubble Sort': bubble_sort,
-    'Selection Sort': selection_sort,
-    'Insertion Sort': insertion_sort,
-    'Merge Sort': merge_sort,
-    'Quick Sort': quick_sort
-}
+import diskcache
+
+from components import cost_summary, playback_controls, register_playback, uncached_manager
+from sorting import ALGORITHMS, DISTRIBUTIONS, Trace, generate
+from sorting.algorithms import engine_version
+from sorting.bench import budgeted_benchmark, cost, format_bytes, format_ns, parallel_speedup
+from sorting.cache import cache_dir
+from sorting.jobs import JobTimeout, run_job
+from sorting.parallel import record_all
+from sorting.wire import encode_payload, json_size
+
+sorting_algorithms = ALGORITHMS
+
+# Input sizes offered on the page; above 2000 items (LARGE_ARRAY_SIZE in assets/playback.js)
+# the browser draws min/max envelopes
+SIZES = (50, 1000, 10000)
+DATA_SIZE = 50
+# Each stopwatch sort gets this much time for its repeats before it is timed only once
+STOPWATCH_BUDGET_NS = 2 * 10**9
+# Longer traces are refused: they would take too long to record and to ship
+MAX_TRACE_OPS = 5_000_000
+# Large enough for the worker processes to pay off, small enough to finish within the job timeout
+PARALLEL_SIZE = 50000
+
+TRACE_CACHE_BYTES = 256 * 1024 * 1024
+
+_trace_cache = None
+
+def trace_cache():
+    # Traces are recorded inside background-job processes that exit after each
+    # job, so an in-memory cache would start empty every time; on disk they are
+    # shared by every job and worker.  The trace callback itself is not
+    # cached (see uncached_manager), so this is what makes repeat views cheap.
+    global _trace_cache
+    if _trace_cache is None:
+        _trace_cache = diskcache.Cache(cache_dir('compare-traces'), size_limit=TRACE_CACHE_BYTES,
+                                       eviction_policy='least-recently-used')
+    return _trace_cache
+
+def get_runs(algos, distribution, size, seed):
+    """Trace and cost record of each algorithm on the seeded input, recording only what is not cached.
+
+    An algorithm whose trace would exceed MAX_TRACE_OPS gets a None trace.
+    """
+    cache = trace_cache()
+    keys = {algo: (algo, distribution, size, seed, engine_version()) for algo in algos}
+    runs = {algo: cache.get(key) for algo, key in keys.items()}
+    missing = [algo for algo, run in runs.items() if run is None]
+    if missing:
+        # Every missing pane is recorded concurrently, one worker process each;
+        # peak memory is measured once here and cached with the trace
+        data = generate(distribution, size, seed)
+        for algo, trace in zip(missing, record_all(missing, data, MAX_TRACE_OPS)):
+            runs[algo] = {'trace': trace, 'cost': cost(algo, data, trace) if trace else None}
+            cache.set(keys[algo], runs[algo])
+    return [runs[algo] for algo in algos]
+
+def trace_payloads(algos, distribution, size, seed, race=False):
+    """Playback payload and cost line of each pane; both are None for an empty pane."""
+    chosen = tuple(algo for algo in algos if algo is not None)
+    error = None
+    try:
+        runs = dict(zip(chosen, run_job(get_runs, chosen, distribution, size, seed)))
+    except JobTimeout as e:
+        error = e
+    payloads, costs = [], []
+    for algo in algos:
+        if algo is None:
+            payloads.append(None)
+            costs.append(None)
+        elif error or runs[algo]['trace'] is None:
+            reason = error or f'more than {MAX_TRACE_OPS:,} operations at n = {size:,}, pick a smaller size'
+            payloads.append(dict(Trace([]).to_dict(), name=f'{algo}: {reason}'))
+            costs.append(None)
+        else:
+            trace = runs[algo]['trace']
+            payload = dict(trace.to_dict(), name=algo)
+            if race:
+                # Race mode plays both panes on a shared clock of comparisons + writes
+                payload['cost'], payload['total_cost'] = trace.cost_clock()
+            payloads.append(payload)
+            costs.append(cost_summary(runs[algo]['cost']))
+    return payloads, costs
 
 dash.register_page(__name__, path='/compare', name="Compare Algorithms", external_stylesheets=[dbc.themes.BOOTSTRAP])
 
-layout = dbc.Container([
-    html.H1("Sorting Algorithm Speed Comparison", className="text-center"),
-    html.Br(),
-    dbc.Row([
-        dbc.Col([
-            dcc.Dropdown(
-                id='algorithm-dropdown1',
-                options=[{'label': algo, 'value': algo} for algo in sorting_algorithms.keys()],
-                value='Bubble Sort'
-            ),
-            dcc.Graph(id='comparison-graph1')
+def layout(**kwargs):
+    return dbc.Container([
+        html.H1("Sorting Algorithm Speed Comparison", className="text-center"),
+        html.Br(),
+        # Both panes and the stopwatch sort the same seeded input
+        dbc.Row([
+            dbc.Col(dcc.Dropdown(
+                id='distribution-dropdown',
+                options=[{'label': distribution.replace('-', ' ').capitalize(), 'value': distribution} for distribution in DISTRIBUTIONS],
+                value='uniform',
+                clearable=False
+            )),
+            dbc.Col(dcc.Dropdown(
+                id='size-dropdown',
+                options=[{'label': f'{size:,} items', 'value': size} for size in SIZES],
+                value=DATA_SIZE,
+                clearable=False
+            ), width=3),
         ]),
         html.Br(),
-        dbc.Col([
-            dcc.Dropdown(
-                id='algorithm-dropdown2',
-                options=[{'label': algo, 'value': algo} for algo in sorting_algorithms.keys()],
-                value='Selection Sort'
-            ),
-            dcc.Graph(id='comparison-graph2')
-        ])
-    ]),
-    html.Br(),
-    dbc.Row([
-        dbc.Col(
-            html.Div(id='stopwatch', className="text-center")
-        )
-    ]),
-    dcc.Interval(
-        id='interval-component',
-        interval=1000, 
-        n_intervals=0
-    )
-], className="mt-5")
+        dbc.Row([
+            dbc.Col([
+                dcc.Dropdown(
+                    id='algorithm-dropdown1',
+                    options=[{'label': algo, 'value': algo} for algo in sorting_algorithms.keys()],
+                    value='Bubble Sort'
+                ),
+                dcc.Graph(id='comparison-graph1'),
+                html.Div(id='comparison-cost1')
+            ]),
+            html.Br(),
+            dbc.Col([
+                dcc.Dropdown(
+                    id='algorithm-dropdown2',
+                    options=[{'label': algo, 'value': algo} for algo in sorting_algorithms.keys()],
+                    value='Selection Sort'
+                ),
+                dcc.Graph(id='comparison-graph2'),
+                html.Div(id='comparison-cost2')
+            ])
+        ]),
+        playback_controls('compare'),
+        dbc.Switch(id='compare-race', label='Race: advance both panes by equal work (comparisons + writes)', value=False),
+        dbc.Switch(id='compare-binary', label='Compact binary traces', value=False),
+        html.Small(id='compare-wire', className='text-muted'),
+        html.Br(),
+        dbc.Row([
+            dbc.Col(
+                html.Div(id='stopwatch', className="text-center")
+            )
+        ]),
+        html.Br(),
+        dbc.Row([
+            dbc.Col([
+                dbc.Button(f'Measure parallel speedup ({PARALLEL_SIZE:,} items)', id='parallel-run', color='secondary'),
+                html.Div(id='parallel-speedup', className="mt-3")
+            ], className="text-center")
+        ]),
+        dcc.Store(id='compare-seed', data=random.randrange(2**31)),
+        dcc.Store(id='comparison-trace1'),
+        dcc.Store(id='comparison-trace2')
+    ], className="mt-5")
 
 @callback(
-    Output('comparison-graph1', 'figure'),
+    [Output('comparison-trace1', 'data'),
+     Output('comparison-trace2', 'data'),
+     Output('comparison-cost1', 'children'),
+     Output('comparison-cost2', 'children'),
+     Output('compare-wire', 'children')],
     [Input('algorithm-dropdown1', 'value'),
-     Input('interval-component', 'n_intervals')]
-)
-def update_comparison_graph1(algo1, n_intervals):
-    if algo1 is None:
-        return go.Figure()
-
-    data = random.sample(range(1, 1001), 50)
-    states = sorting_algorithms[algo1](data.copy())
-    frame_idx = min(n_intervals, len(states) - 1)
-    n = len(states[frame_idx])
-    fig = go.Figure(go.Bar(x=list(range(1, n + 1)), y=states[frame_idx], marker_color='blue'))
-    fig.update_layout(title=f'{algo1}', xaxis=dict(title='Index'), yaxis=dict(title='Value'))
-
-    return fig
-
-@callback(
-    Output('comparison-graph2', 'figure'),
-    [Input('algorithm-dropdown2', 'value'),
-     Input('interval-component', 'n_intervals')]
+     Input('algorithm-dropdown2', 'value'),
+     Input('distribution-dropdown', 'value'),
+     Input('size-dropdown', 'value'),
+     Input('compare-race', 'value'),
+     Input('compare-binary', 'value')],
+    [State('compare-seed', 'data')],
+    # Timeouts are returned as output, so results are not cached; get_runs caches the traces
+    background=True,
+    manager=uncached_manager()
 )
-def update_comparison_graph2(algo2, n_intervals):
-    if algo2 is None:
-        return go.Figure()
-
-    data = random.sample(range(1, 1001), 50)
-    states = sorting_algorithms[algo2](data.copy())
-    frame_idx = min(n_intervals, len(states) - 1)
-    n = len(states[frame_idx])
-    fig = go.Figure(go.Bar(x=list(range(1, n + 1)), y=states[frame_idx], marker_color='blue'))
-    fig.update_layout(title=f'{algo2}', xaxis=dict(title='Index'), yaxis=dict(title='Value'))
+def update_comparison_traces(algo1, algo2, distribution, size, race, binary, seed):
+    payloads, costs = trace_payloads([algo1, algo2], distribution, size, seed, race)
+    encoded = [encode_payload(payload) for payload in payloads]
+    # Both sizes are reported so the saving is visible whichever format is sent
+    wire = f'Trace payloads: {format_bytes(json_size(payloads))} as JSON lists, {format_bytes(json_size(encoded))} as binary'
+    return (encoded if binary else payloads) + costs + [wire]
 
-    return fig
+register_playback('compare', ['comparison-trace1', 'comparison-trace2'], ['comparison-graph1', 'comparison-graph2'])
 
 @callback(
     Output('stopwatch', 'children'),
     [Input('algorithm-dropdown1', 'value'),
-     Input('algorithm-dropdown2', 'value')]
+     Input('algorithm-dropdown2', 'value'),
+     Input('distribution-dropdown', 'value'),
+     Input('size-dropdown', 'value')],
+    [State('compare-seed', 'data')],
+    background=True,
+    manager=uncached_manager()
 )
-def update_stopwatch(algo1, algo2):
+def update_stopwatch(algo1, algo2, distribution, size, seed):
     if algo1 is None or algo2 is None:
         return html.Div()
 
-    data = random.sample(range(1, 1001), 50)
-    start_time = time.time()
-    sorting_algorithms[algo1](data.copy())
-    end_time_algo1 = time.time()
-    sorting_algorithms[algo2](data.copy())
-    end_time_algo2 = time.time()
-    
-    return html.Div(f'{algo1} execution time: {end_time_algo1 - start_time:.2f} seconds, {algo2} execution time: {end_time_algo2 - start_time:.2f} seconds', className="mt-3")
+    # Both algorithms are timed on the same input the panes animate
+    data = generate(distribution, size, seed)
+    try:
+        # Slow sorts (the quadratic ones at 10,000 items) are timed once so both fit the job timeout
+        results = [(algo, run_job(budgeted_benchmark, algo, data, 7, STOPWATCH_BUDGET_NS)) for algo in (algo1, algo2)]
+    except JobTimeout as e:
+        return html.Div(str(e), className="mt-3")
+
+    return html.Div(', '.join(
+        f"{algo} execution time: {format_ns(result['median_ns'])} "
+        + (f"(IQR {format_ns(result['iqr_ns'])}, {result['ops_per_sec']:,.0f} sorts/s)" if result['repeats'] > 1 else '(single run)')
+        for algo, result in results
+    ), className="mt-3")
+
+@callback(
+    Output('parallel-speedup', 'children'),
+    [Input('parallel-run', 'n_clicks')],
+    [State('distribution-dropdown', 'value'),
+     State('compare-seed', 'data')],
+    background=True,
+    manager=uncached_manager(),
+    running=[(Output('parallel-run', 'disabled'), True, False)],
+    prevent_initial_call=True
+)
+def update_parallel_speedup(n_clicks, distribution, seed):
+    try:
+        rows = run_job(parallel_speedup, (PARALLEL_SIZE,), None, (distribution,), seed, 3)
+    except JobTimeout as e:
+        return html.Div(str(e))
+
+    return dbc.Table([
+        html.Thead(html.Tr([html.Th('Algorithm'), html.Th('Workers'), html.Th('Median'), html.Th('Speedup')])),
+        html.Tbody([
+            html.Tr([html.Td(row['algorithm']), html.Td(row['workers']), html.Td(format_ns(row['median_ns'])), html.Td(f"{row['speedup']:.2f}x")])
+            for row in rows
+        ])
+    ], bordered=True, size='sm')
@@ -1,63 +1,47 @@
 import dash
-from dash import dcc, html, Input, Output, callback
-import plotly.graph_objs as go
-from math import log
+from dash import dcc, html, Input, Output, clientside_callback
 import dash_bootstrap_components as dbc
 
+from components import complexity_figures
+
 dash.register_page(__name__, path='/guess', name="Guess the Algorithms", external_stylesheets=[dbc.themes.BOOTSTRAP])
 
-layout = html.Div([
-    html.H1("Sorting Algorithm Big O Graphs", className="text-center"),
-    dcc.Graph(
-        id='big-o-graph',
-        figure={
-            'data': [],
-            'layout': {}
-        }
-    ),
-    html.Label('Select the Sorting Algorithm:'),
-    dcc.Dropdown(
-        id='algorithm-dropdown',
-        options=[
-            {'label': 'Bubble Sort', 'value': 'bubble'},
-            {'label': 'Selection Sort', 'value': 'selection'},
-            {'label': 'Insertion Sort', 'value': 'insertion'},
-            {'label': 'Merge Sort', 'value': 'merge'},
-            {'label': 'Quick Sort', 'value': 'quick'}
-        ],
-        value=None
-    ),
-    html.Div(id='output')
-])
+ALGORITHM_NAMES = {
+    'bubble': 'Bubble Sort',
+    'selection': 'Selection Sort',
+    'insertion': 'Insertion Sort',
+    'merge': 'Merge Sort',
+    'quick': 'Quick Sort'
+}
+
+def layout(**kwargs):
+    return html.Div([
+        html.H1("Sorting Algorithm Big O Graphs", className="text-center"),
+        dcc.Graph(
+            id='big-o-graph',
+            figure={
+                'data': [],
+                'layout': {}
+            }
+        ),
+        html.Label('Select the Sorting Algorithm:'),
+        dcc.Dropdown(
+            id='algorithm-dropdown',
+            options=[{'label': name, 'value': value} for value, name in ALGORITHM_NAMES.items()],
+            value=None
+        ),
+        html.Div(id='output'),
+        dcc.Store(id='big-o-figures', data={value: complexity_figures()[name] for value, name in ALGORITHM_NAMES.items()})
+    ])
 
-@callback(
+# Figures are built once and shipped with the layout; picking one needs no server round-trip
+clientside_callback(
+    """
+    function(selected, figures) {
+        return selected ? figures[selected] : {data: [], layout: {}};
+    }
+    """,
     Output('big-o-graph', 'figure'),
-    [Input('algorithm-dropdown', 'value')]
+    [Input('algorithm-dropdown', 'value'),
+     Input('big-o-figures', 'data')]
 )
-def update_big_o_graph(selected_algorithm):
-    if selected_algorithm is None:
-        return {
-            'data': [],
-            'layout': {}
-        }
-
-    if selected_algorithm == 'bubble':
-        x = [n for n in range(1, 101)]
-        y = [n**2 for n in range(1, 101)]  
-    elif selected_algorithm == 'selection':
-        x = [n for n in range(1, 101)]
-        y = [n**2 for n in range(1, 101)]  
-    elif selected_algorithm == 'insertion':
-        x = [n for n in range(1, 101)]
-        y = [n**2 for n in range(1, 101)]  
-    elif selected_algorithm == 'merge':
-        x = [n for n in range(1, 101)]
-        y = [n * log(n) for n in range(1, 101)]  
-    elif selected_algorithm == 'quick':
-        x = [n for n in range(1, 101)]
-        y = [n * log(n) for n in range(1, 101)]  
-
-    graph_data = go.Scatter(x=x, y=y, mode='lines', name=f'O({selected_algorithm})')
-    layout = go.Layout(title=f'Big O Graph for {selected_algorithm} Sort', xaxis=dict(title='Input Size (n)'),
-                       yaxis=dict(title='Time Complexity'))
-    return {'data': [graph_data], 'layout': layout}
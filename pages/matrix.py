@@ -0,0 +1,76 @@
+import math
+
+import dash
+from dash import dcc, html, Input, Output, State, callback
+import dash_bootstrap_components as dbc
+import plotly.graph_objs as go
+
+from sorting import ALGORITHMS, DISTRIBUTIONS
+from sorting.bench import format_ns
+from sorting.matrix import load_matrix, run_matrix
+
+dash.register_page(__name__, path='/matrix', name="Benchmark Matrix", external_stylesheets=[dbc.themes.BOOTSTRAP])
+
+def matrix_figure(rows, distribution):
+    # Color is log10 of the time per item, so one scale covers every size
+    rows = [row for row in rows if row['distribution'] == distribution]
+    names = [name for name in ALGORITHMS if any(row['algorithm'] == name for row in rows)]
+    sizes = sorted({row['size'] for row in rows})
+    cells = {(row['algorithm'], row['size']): row for row in rows}
+    z, text = [], []
+    for name in names:
+        z.append([math.log10(cells[name, size]['median_ns'] / size) if (name, size) in cells else None for size in sizes])
+        text.append([format_ns(cells[name, size]['median_ns']) if (name, size) in cells else '' for size in sizes])
+    fig = go.Figure(go.Heatmap(
+        x=[f'n = {size:,}' for size in sizes],
+        y=names,
+        z=z,
+        text=text,
+        texttemplate='%{text}',
+        colorscale='Viridis',
+        colorbar=dict(title='log10 ns / item'),
+        hovertemplate='%{y}, %{x}: %{text}<extra></extra>',
+    ))
+    fig.update_layout(title=f'Median sort time, {distribution} input', xaxis=dict(type='category'), yaxis=dict(autorange='reversed'))
+    return fig
+
+def layout(**kwargs):
+    return dbc.Container([
+        html.H1("Benchmark Matrix", className="text-center"),
+        html.Br(),
+        dcc.Dropdown(
+            id='matrix-distribution',
+            options=[{'label': distribution.replace('-', ' ').capitalize(), 'value': distribution} for distribution in DISTRIBUTIONS],
+            value='uniform',
+            clearable=False
+        ),
+        dcc.Graph(id='matrix-heatmap'),
+        dbc.Button('Measure missing cells', id='matrix-run', color='secondary'),
+        html.Div(id='matrix-progress', className="mt-3"),
+        html.Div(id='matrix-status'),
+    ], className="mt-5")
+
+@callback(
+    Output('matrix-heatmap', 'figure'),
+    [Input('matrix-distribution', 'value'),
+     Input('matrix-progress', 'children'),
+     Input('matrix-status', 'children')]
+)
+def update_matrix_heatmap(distribution, progress, status):
+    return matrix_figure(load_matrix(), distribution)
+
+@callback(
+    Output('matrix-status', 'children'),
+    [Input('matrix-run', 'n_clicks')],
+    # The click time makes each run its own entry in the background-callback
+    # cache; n_clicks alone repeats across sessions and would replay an old result
+    [State('matrix-run', 'n_clicks_timestamp')],
+    background=True,
+    running=[(Output('matrix-run', 'disabled'), True, False)],
+    progress=[Output('matrix-progress', 'children')],
+    prevent_initial_call=True
+)
+def update_matrix(set_progress, n_clicks, clicked_at):
+    # Only cells of algorithms whose source changed are measured; each is saved as it finishes
+    measured = run_matrix(progress=lambda done, total: set_progress(f'Measured {done} of {total} cells'))
+    return f'Measured {measured} cells' if measured else 'Every cell is up to date'
@@ -0,0 +1,5 @@
+from sorting.trace import Trace, TraceTooLong, OpCounter, COMPARE, SWAP, WRITE
+from sorting.algorithms import ALGORITHMS, get_algorithm, run, count, record
+from sorting.cache import TraceCache
+from sorting.datasets import DISTRIBUTIONS, generate
+from sorting.sessions import SessionRegistry
@@ -0,0 +1,301 @@
+import functools
+import hashlib
+import inspect
+
+from sorting.trace import Trace, OpCounter
+
+# Every algorithm sorts ``arr`` in place and returns it.  Passing a probe
+# (Trace or OpCounter) records each compare/swap/write and every auxiliary
+# buffer it allocates; without one the algorithm runs in result-only mode
+# and only pays for a local flag check.
+
+
+def bubble_sort(arr, probe=None):
+    traced = probe is not None
+    n = len(arr)
+    for i in range(n - 1):
+        for j in range(0, n - i - 1):
+            if traced:
+                probe.compare(j, j + 1)
+            if arr[j] > arr[j + 1]:
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                if traced:
+                    probe.swap(j, j + 1)
+    return arr
+
+
+def selection_sort(arr, probe=None):
+    traced = probe is not None
+    n = len(arr)
+    for i in range(n):
+        min_idx = i
+        for j in range(i + 1, n):
+            if traced:
+                probe.compare(j, min_idx)
+            if arr[j] < arr[min_idx]:
+                min_idx = j
+        arr[i], arr[min_idx] = arr[min_idx], arr[i]
+        if traced:
+            probe.swap(i, min_idx)
+    return arr
+
+
+def insertion_sort(arr, probe=None):
+    _insertion_sort_range(arr, 0, len(arr) - 1, probe)
+    return arr
+
+
+def _insertion_sort_range(arr, lo, hi, probe=None):
+    traced = probe is not None
+    for i in range(lo + 1, hi + 1):
+        key = arr[i]
+        j = i - 1
+        while j >= lo:
+            if traced:
+                probe.compare(j + 1, j)
+            if not key < arr[j]:
+                break
+            arr[j + 1] = arr[j]
+            if traced:
+                probe.write(j + 1, arr[j])
+            j -= 1
+        arr[j + 1] = key
+        if traced:
+            probe.write(j + 1, key)
+
+
+def merge_sort(arr, probe=None):
+    """Bottom-up merge sort that ping-pongs between ``arr`` and one auxiliary buffer.
+
+    Writes are recorded at their destination index, so a trace always shows
+    the output of the current pass whichever buffer it lands in.
+    """
+    traced = probe is not None
+    n = len(arr)
+    src, dst = arr, [None] * n
+    if traced:
+        probe.alloc(n)
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            if mid < hi:
+                if traced:
+                    probe.compare(mid - 1, mid)
+                if src[mid] < src[mid - 1]:
+                    _merge(src, dst, lo, mid, hi, probe)
+                    continue
+            # Already in order: carry the block over unchanged, element by
+            # element so no temporary slice is built
+            for k in range(lo, hi):
+                dst[k] = src[k]
+        src, dst = dst, src
+        width *= 2
+    if src is not arr:
+        arr[:] = src
+    return arr
+
+
+def _merge(src, dst, lo, mid, hi, probe=None):
+    traced = probe is not None
+    i, j = lo, mid
+    for k in range(lo, hi):
+        if i < mid and j < hi:
+            if traced:
+                probe.compare(i, j)
+            take_right = src[j] < src[i]
+        else:
+            take_right = i >= mid
+        if take_right:
+            dst[k] = src[j]
+            j += 1
+        else:
+            dst[k] = src[i]
+            i += 1
+        if traced:
+            probe.write(k, dst[k])
+
+
+# Ranges this short are finished by insertion sort instead of partitioning
+INSERTION_CUTOFF = 16
+
+
+def quick_sort(arr, probe=None):
+    """In-place introsort: median-of-three quicksort on an explicit stack,
+    insertion sort for short ranges and heapsort once the depth limit is hit."""
+    traced = probe is not None
+    stack = [(0, len(arr) - 1, 2 * len(arr).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo >= INSERTION_CUTOFF:
+            if depth == 0:
+                _heap_sort_range(arr, lo, hi, probe)
+                break
+            depth -= 1
+
+            # Median of arr[lo], arr[mid], arr[hi] becomes the pivot at lo; the
+            # largest stays at hi and bounds the left scan
+            mid = (lo + hi) // 2
+            for i, j in ((mid, lo), (hi, lo), (hi, mid)):
+                if traced:
+                    probe.compare(i, j)
+                if arr[i] < arr[j]:
+                    arr[i], arr[j] = arr[j], arr[i]
+                    if traced:
+                        probe.swap(i, j)
+            arr[lo], arr[mid] = arr[mid], arr[lo]
+            if traced:
+                probe.swap(lo, mid)
+
+            # Hoare partition; both scans stop on keys equal to the pivot
+            pivot = arr[lo]
+            i, j = lo, hi + 1
+            while True:
+                i += 1
+                while True:
+                    if traced:
+                        probe.compare(i, lo)
+                    if not arr[i] < pivot:
+                        break
+                    i += 1
+                j -= 1
+                while True:
+                    if traced:
+                        probe.compare(lo, j)
+                    if not pivot < arr[j]:
+                        break
+                    j -= 1
+                if i >= j:
+                    break
+                arr[i], arr[j] = arr[j], arr[i]
+                if traced:
+                    probe.swap(i, j)
+            arr[lo], arr[j] = arr[j], arr[lo]
+            if traced:
+                probe.swap(lo, j)
+
+            # Defer the larger side and keep going on the smaller one, so the
+            # stack never holds more than O(log n) ranges
+            if j - lo < hi - j:
+                stack.append((j + 1, hi, depth))
+                hi = j - 1
+            else:
+                stack.append((lo, j - 1, depth))
+                lo = j + 1
+        else:
+            _insertion_sort_range(arr, lo, hi, probe)
+    return arr
+
+
+def _heap_sort_range(arr, lo, hi, probe=None):
+    traced = probe is not None
+    n = hi - lo + 1
+    for root in range(n // 2 - 1, -1, -1):
+        _sift_down(arr, lo, root, n, probe)
+    for end in range(n - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        if traced:
+            probe.swap(lo, lo + end)
+        _sift_down(arr, lo, 0, end, probe)
+
+
+def _sift_down(arr, lo, root, n, probe=None):
+    # Max-heap over arr[lo:lo + n], with children of i at 2i + 1 and 2i + 2
+    traced = probe is not None
+    while True:
+        child = 2 * root + 1
+        if child >= n:
+            return
+        if child + 1 < n:
+            if traced:
+                probe.compare(lo + child, lo + child + 1)
+            if arr[lo + child] < arr[lo + child + 1]:
+                child += 1
+        if traced:
+            probe.compare(lo + root, lo + child)
+        if not arr[lo + root] < arr[lo + child]:
+            return
+        arr[lo + root], arr[lo + child] = arr[lo + child], arr[lo + root]
+        if traced:
+            probe.swap(lo + root, lo + child)
+        root = child
+
+
+ALGORITHMS = {
+    'Bubble Sort': bubble_sort,
+    'Selection Sort': selection_sort,
+    'Insertion Sort': insertion_sort,
+    'Merge Sort': merge_sort,
+    'Quick Sort': quick_sort
+}
+
+
+def get_algorithm(algorithm):
+    if callable(algorithm):
+        return algorithm
+    try:
+        return ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f'Unknown sorting algorithm: {algorithm}') from None
+
+
+def _referenced_names(code):
+    # Names used by a function and by the lambdas/comprehensions nested in it
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _referenced_names(const)
+    return names
+
+
+def source_hash(algorithm):
+    """Short hash of an algorithm's source, used to key cached measurements.
+
+    Every module-level helper reachable from the function is included, as
+    is the value of every module-level constant any of them reads, so
+    changing a helper or a tuning constant invalidates results for every
+    algorithm that depends on it.
+    """
+    sort = get_algorithm(algorithm)
+    digest = hashlib.sha256()
+    pending, seen = [sort], set()
+    while pending:
+        function = pending.pop()
+        if function in seen:
+            continue
+        seen.add(function)
+        digest.update(inspect.getsource(function).encode())
+        for name in sorted(_referenced_names(function.__code__)):
+            value = function.__globals__.get(name)
+            if inspect.isfunction(value) and value.__module__ == sort.__module__:
+                pending.append(value)
+            elif isinstance(value, (bool, int, float, str, bytes, tuple)):
+                digest.update(f'{name}={value!r}'.encode())
+    return digest.hexdigest()[:12]
+
+
+@functools.lru_cache(maxsize=None)
+def engine_version():
+    """Combined source hash of every registered algorithm."""
+    return hashlib.sha256(''.join(source_hash(name) for name in ALGORITHMS).encode()).hexdigest()[:12]
+
+
+def run(algorithm, data):
+    """Result-only mode: return a sorted copy of ``data``."""
+    return get_algorithm(algorithm)(list(data))
+
+
+def count(algorithm, data):
+    """Return an OpCounter with the comparisons, swaps, writes and allocations of one run."""
+    counter = OpCounter()
+    get_algorithm(algorithm)(list(data), counter)
+    return counter
+
+
+def record(algorithm, data, max_ops=None):
+    """Trace mode: return the full operation Trace of one run (see Trace for ``max_ops``)."""
+    arr = list(data)
+    recorded = Trace(arr, max_ops)
+    get_algorithm(algorithm)(arr, recorded)
+    return recorded
@@ -0,0 +1,208 @@
+import argparse
+import functools
+import gc
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+from sorting.algorithms import ALGORITHMS, count, get_algorithm
+from sorting.datasets import DISTRIBUTIONS, generate
+from sorting.parallel import close_pools, parallel_merge_sort
+
+
+def measure(algorithm, data, repeats=7, warmup=1, disable_gc=True):
+    """Time ``repeats`` result-only runs of ``algorithm`` on copies of ``data``.
+
+    Returns the per-run wall times in nanoseconds.  Copying the input is
+    kept outside the timed region, and the collector is paused so a
+    collection triggered by earlier garbage does not land inside a run.
+    """
+    sort = get_algorithm(algorithm)
+    for _ in range(warmup):
+        sort(list(data))
+
+    gc_was_enabled = gc.isenabled()
+    samples = []
+    try:
+        for _ in range(repeats):
+            arr = list(data)
+            if disable_gc:
+                gc.collect()
+                gc.disable()
+            start = time.perf_counter_ns()
+            sort(arr)
+            samples.append(time.perf_counter_ns() - start)
+            if gc_was_enabled:
+                gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def summarize(samples, size):
+    if len(samples) > 1:
+        q1, median, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+    else:
+        q1 = median = q3 = samples[0]
+    median = max(median, 1)
+    return {
+        'size': size,
+        'repeats': len(samples),
+        'median_ns': median,
+        'q1_ns': q1,
+        'q3_ns': q3,
+        'iqr_ns': q3 - q1,
+        'min_ns': min(samples),
+        'ops_per_sec': 1e9 / median,
+        'items_per_sec': size * 1e9 / median,
+    }
+
+
+def benchmark(algorithm, data, repeats=7, warmup=1, disable_gc=True):
+    return summarize(measure(algorithm, data, repeats, warmup, disable_gc), len(data))
+
+
+def budgeted_benchmark(algorithm, data, repeats=7, budget_ns=2 * 10**9):
+    """benchmark(), except that a sort whose first run predicts more than
+    ``budget_ns`` for all ``repeats`` is reported from that single run."""
+    first = measure(algorithm, data, repeats=1, warmup=0)
+    if first[0] * repeats > budget_ns:
+        return summarize(first, len(data))
+    return benchmark(algorithm, data, repeats)
+
+
+# tracemalloc is global to the process, so only one measurement may run at a time
+_memory_lock = threading.Lock()
+
+
+def peak_memory(algorithm, data):
+    """Peak bytes one result-only run allocates on top of its input list.
+
+    tracemalloc also counts other threads' allocations, so this is meant
+    for single-threaded processes: the command line, background jobs and
+    pool workers.  Request handlers use complexity.peak_bytes(), measured
+    once per (algorithm, size) with the complexity curves.
+    """
+    sort = get_algorithm(algorithm)
+    with _memory_lock:
+        arr = list(data)
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            sort(arr)
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+    return max(peak, 0)
+
+
+def cost(algorithm, data, probe=None, peak_bytes=None):
+    """Cost record of one run: operation counts, reported buffers and peak extra memory.
+
+    Operations come from ``probe``, a Trace or OpCounter already recorded
+    on ``data``, or from a new counting run.  Memory is ``peak_bytes`` when
+    given, otherwise it is measured with peak_memory().
+    """
+    if probe is None:
+        probe = count(algorithm, data)
+    if peak_bytes is None:
+        peak_bytes = peak_memory(algorithm, data)
+    return {
+        'size': len(data),
+        'comparisons': probe.comparisons,
+        'swaps': probe.swaps,
+        'writes': probe.writes,
+        'allocations': probe.allocations,
+        'allocated_items': probe.allocated,
+        'peak_bytes': peak_bytes,
+    }
+
+
+def sweep(algorithms=None, sizes=(100, 1000), distributions=('uniform',), seed=0, repeats=7, warmup=1, disable_gc=True, costs=False):
+    results = []
+    for distribution in distributions:
+        for size in sizes:
+            data = generate(distribution, size, seed)
+            for name in algorithms or ALGORITHMS:
+                row = benchmark(name, data, repeats, warmup, disable_gc)
+                if costs:
+                    row.update(cost(name, data))
+                row.update(algorithm=name, distribution=distribution, seed=seed)
+                results.append(row)
+    return results
+
+
+def core_counts(limit=None):
+    """Powers of two up to ``limit`` (default: the CPU count), plus ``limit`` itself."""
+    limit = limit or os.cpu_count() or 1
+    return sorted({1 << i for i in range(limit.bit_length())} | {limit})
+
+
+def parallel_speedup(sizes=(100000,), workers=None, distributions=('uniform',), seed=0, repeats=5, warmup=1):
+    """Time parallel_merge_sort at each worker count against the sequential merge_sort."""
+    results = []
+    try:
+        for distribution in distributions:
+            for size in sizes:
+                data = generate(distribution, size, seed)
+                baseline = benchmark('Merge Sort', data, repeats, warmup)
+                baseline.update(algorithm='Merge Sort', workers=1, speedup=1.0, distribution=distribution, seed=seed)
+                results.append(baseline)
+                for count in workers or core_counts():
+                    row = benchmark(functools.partial(parallel_merge_sort, workers=count), data, repeats, warmup)
+                    row.update(algorithm='Parallel Merge Sort', workers=count, speedup=baseline['median_ns'] / row['median_ns'],
+                               distribution=distribution, seed=seed)
+                    results.append(row)
+    finally:
+        # Pools are reused across repeats and worker counts, then released
+        close_pools()
+    return results
+
+
+def format_ns(ns):
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('µs', 1e3)):
+        if ns >= scale:
+            return f'{ns / scale:.2f} {unit}'
+    return f'{ns:.0f} ns'
+
+
+def format_bytes(nbytes):
+    for unit, scale in (('GiB', 1 << 30), ('MiB', 1 << 20), ('KiB', 1 << 10)):
+        if nbytes >= scale:
+            return f'{nbytes / scale:.1f} {unit}'
+    return f'{nbytes} B'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the sorting engine and print JSON results.')
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000])
+    parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=['uniform'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--keep-gc', action='store_true', help='leave the garbage collector enabled while timing')
+    parser.add_argument('--cost', action='store_true', help='add operation counts and peak memory (tracemalloc) to each row')
+    parser.add_argument('--parallel', action='store_true', help='compare parallel_merge_sort with merge_sort instead')
+    parser.add_argument('--workers', nargs='+', type=int, help='worker counts for --parallel (default: powers of two up to the CPU count)')
+    args = parser.parse_args(argv)
+
+    if args.parallel:
+        results = parallel_speedup(args.sizes, args.workers, args.distributions, args.seed, args.repeats, args.warmup)
+    else:
+        results = sweep(args.algorithms, args.sizes, args.distributions, args.seed, args.repeats, args.warmup, not args.keep_gc, args.cost)
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import os
+import threading
+from collections import OrderedDict
+
+CACHE_ROOT = os.environ.get('SORT_CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache'))
+
+
+def cache_dir(*parts):
+    path = os.path.join(CACHE_ROOT, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class TraceCache:
+    """Size-bounded in-process LRU cache of traces (anything with ``nbytes``)."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, compute):
+        with self._lock:
+            trace = self._entries.get(key)
+            if trace is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return trace
+            self.misses += 1
+
+        # Computed outside the lock so a slow sort does not block other lookups
+        trace = compute()
+        with self._lock:
+            if key not in self._entries and trace.nbytes <= self.max_bytes:
+                self._entries[key] = trace
+                self.nbytes += trace.nbytes
+                while self.nbytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.nbytes -= evicted.nbytes
+                    self.evictions += 1
+        return trace
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'nbytes': self.nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
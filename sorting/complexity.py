@@ -0,0 +1,122 @@
+import json
+import math
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sorting.algorithms import ALGORITHMS, count, source_hash
+from sorting.bench import measure, peak_memory
+from sorting.cache import cache_dir
+from sorting.datasets import generate
+
+# Includes the input sizes the pages show, so their peak memory is measured here
+SIZES = (10, 20, 30, 50, 100, 300, 1000, 3000, 10000, 30000, 100000)
+# Peak memory is measured up to this size; tracemalloc slows a run down many times over
+PEAK_MAX_SIZE = 10000
+# Stop climbing the size ladder once the next point is predicted to take longer than this
+POINT_BUDGET_NS = 5 * 10**9
+# Bump when the measurement method changes so cached curves are recomputed
+METHOD_VERSION = 2
+
+_curves = {}
+_lock = threading.Lock()
+
+
+def fit_exponent(sizes, values):
+    """Least-squares slope of log(value) against log(size)."""
+    points = [(math.log(n), math.log(v)) for n, v in zip(sizes, values) if n >= 100 and v > 0]
+    if len(points) < 2:
+        points = [(math.log(n), math.log(v)) for n, v in zip(sizes, values) if v > 0]
+    if len(points) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def measure_curve(name, sizes=SIZES, budget_ns=POINT_BUDGET_NS, seed=0):
+    """Measure comparisons, median wall time and peak memory of ``name`` across ``sizes``.
+
+    Runs in a single-threaded worker process, which keeps tracemalloc's
+    peak to this sort alone.  Larger sizes are skipped once the previous
+    points predict the next one would exceed ``budget_ns``, which is what
+    keeps the quadratic sorts from running for hours at n = 10^5.
+    """
+    measured, comparisons, times, peaks = [], [], [], []
+    last_elapsed = None
+    for size in sizes:
+        if last_elapsed is not None:
+            exponent = fit_exponent(measured[-2:], times[-2:]) if len(measured) > 1 else 2
+            if last_elapsed * (size / measured[-1]) ** max(exponent or 2, 1) > budget_ns:
+                break
+        start = time.perf_counter_ns()
+        data = generate('uniform', size, seed)
+        comparisons.append(count(name, data).comparisons)
+        times.append(statistics.median(measure(name, data, repeats=3 if size <= 10000 else 1, warmup=0)))
+        peaks.append(peak_memory(name, data) if size <= PEAK_MAX_SIZE else None)
+        measured.append(size)
+        last_elapsed = time.perf_counter_ns() - start
+    return {
+        'algorithm': name,
+        'sizes': measured,
+        'comparisons': comparisons,
+        'time_ns': times,
+        'peak_bytes': peaks,
+        'comparison_exponent': fit_exponent(measured, comparisons),
+        'time_exponent': fit_exponent(measured, times),
+    }
+
+
+def _cache_path(name):
+    slug = name.lower().replace(' ', '-')
+    return os.path.join(cache_dir('complexity'), f'{slug}-{source_hash(name)}-v{METHOD_VERSION}.json')
+
+
+def _load(name):
+    try:
+        with open(_cache_path(name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save(name, curve):
+    path = _cache_path(name)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(curve, f)
+    os.replace(tmp, path)
+
+
+def curves(names=None, max_workers=None):
+    """Measured curves for ``names``, computed in a process pool on first use.
+
+    Results are cached on disk keyed by each algorithm's source hash, so
+    they survive restarts and are shared between workers.
+    """
+    names = list(names or ALGORITHMS)
+    with _lock:
+        missing = []
+        for name in names:
+            if name not in _curves:
+                curve = _load(name)
+                if curve is None:
+                    missing.append(name)
+                else:
+                    _curves[name] = curve
+        if missing:
+            workers = max_workers or min(len(missing), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for name, curve in zip(missing, pool.map(measure_curve, missing)):
+                    _save(name, curve)
+                    _curves[name] = curve
+        return {name: _curves[name] for name in names}
+
+
+def peak_bytes(name, size):
+    """Peak extra memory of ``name`` on ``size`` uniform items from its curve, or None if not measured."""
+    curve = curves([name])[name]
+    return dict(zip(curve['sizes'], curve['peak_bytes'])).get(size)
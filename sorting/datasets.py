@@ -0,0 +1,50 @@
+import functools
+import hashlib
+
+DISTRIBUTIONS = ('uniform', 'nearly-sorted', 'reversed', 'few-unique', 'sawtooth', 'organ-pipe')
+
+# Runs in a sawtooth input, and distinct values in a few-unique one
+TEETH = 5
+FEW_UNIQUE = 10
+
+
+def generate(distribution, size, seed):
+    """Seeded input of ``size`` integers drawn from ``distribution``.
+
+    The same (distribution, size, seed) always gives the same values, so
+    panes and benchmarks that share a seed sort identical inputs.  Results
+    are cached and returned as tuples; callers copy before sorting.
+    ``seed`` may be an int or a string.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f'Unknown distribution: {distribution}')
+    if isinstance(seed, str):
+        seed = int.from_bytes(hashlib.sha256(seed.encode()).digest()[:8], 'little')
+    return _generate(distribution, size, seed)
+
+
+@functools.lru_cache(maxsize=32)
+def _generate(distribution, size, seed):
+    # numpy is imported here so that importing sorting stays cheap
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    # Distinct values from 1..max(1000, size), like random.sample over that range
+    values = rng.choice(max(1000, size), size, replace=False) + 1
+    if distribution == 'nearly-sorted':
+        values.sort()
+        # Swap about 5% of the elements out of place
+        swaps = min(max(1, size // 20), size // 2)
+        i, j = rng.choice(size, 2 * swaps, replace=False).reshape(2, swaps)
+        values[i], values[j] = values[j], values[i].copy()
+    elif distribution == 'reversed':
+        values[::-1].sort()
+    elif distribution == 'few-unique':
+        values = rng.choice(values[:FEW_UNIQUE], size)
+    elif distribution == 'sawtooth':
+        values.sort()
+        values = np.concatenate([values[t::TEETH] for t in range(TEETH)])
+    elif distribution == 'organ-pipe':
+        values.sort()
+        values = np.concatenate([values[0::2], values[1::2][::-1]])
+    return tuple(values.tolist())
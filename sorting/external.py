@@ -0,0 +1,175 @@
+import argparse
+import heapq
+import json
+import os
+import sys
+import tempfile
+from array import array
+from itertools import islice
+
+# Out-of-core sort for int64 files that do not fit in memory.  The input is
+# read in chunks that fit the memory budget, each chunk is sorted and
+# spilled to a run file, and the runs are k-way merged with heapq.merge
+# through fixed-size read and write buffers.
+
+# Cost of one value while a chunk is held as a list: its 8-byte list slot plus the
+# int object, which takes up to this many bytes for int64 values
+ITEM_BYTES = 8 + sys.getsizeof(2**62)
+# Extra bytes per value while a chunk is built or sorted: the array('q') staging
+# copy of the binary path, or timsort's merge buffer of up to half the list
+EXTRA_ITEM_BYTES = {'binary': 8, 'text': 4}
+# Smallest read buffer per run, which caps how many runs one merge pass opens
+MIN_BUFFER_BYTES = 64 * 1024
+MAX_FAN_IN = 128
+FORMATS = ('binary', 'text')
+
+_swap = sys.byteorder != 'little'
+
+
+def _read_chunks(f, fmt, chunk_items):
+    while True:
+        if fmt == 'binary':
+            chunk = array('q')
+            try:
+                chunk.fromfile(f, chunk_items)
+            except EOFError:
+                pass
+            if _swap:
+                chunk.byteswap()
+            chunk = chunk.tolist()
+        else:
+            chunk = [int(line) for line in islice(f, chunk_items) if line.strip()]
+        if not chunk:
+            return
+        yield chunk
+        # Drop this frame's reference, or the list stays alive while the next one is read
+        del chunk
+
+
+def _read_run(f, buffer_items):
+    # Run files are written in native byte order by _write
+    while True:
+        block = array('q')
+        try:
+            block.fromfile(f, buffer_items)
+        except EOFError:
+            pass
+        if not block:
+            return
+        yield from block
+
+
+def _write(f, values, fmt, buffer_items, native=False):
+    count = 0
+    values = iter(values)
+    while True:
+        block = array('q', islice(values, buffer_items))
+        if not block:
+            return count
+        count += len(block)
+        if fmt == 'binary':
+            if _swap and not native:
+                block.byteswap()
+            block.tofile(f)
+        else:
+            f.write(''.join(f'{value}\n' for value in block).encode())
+
+
+def _merge(paths, f, fmt, buffer_items, native=False):
+    files = [open(path, 'rb') for path in paths]
+    try:
+        return _write(f, heapq.merge(*(_read_run(run, buffer_items) for run in files)), fmt, buffer_items, native)
+    finally:
+        for run in files:
+            run.close()
+
+
+def external_sort(source, dest, fmt='binary', memory=64 * 1024 * 1024, directory=None, progress=None):
+    """Sort the integers in ``source`` into ``dest`` using about ``memory`` bytes.
+
+    ``fmt`` is 'binary' (little-endian int64) or 'text' (one integer per
+    line) and applies to both files; ``dest`` may be ``source``.  Run files
+    go to a temporary directory under ``directory``.  ``progress`` is called
+    with a dict after every run is written and every merge, for display.
+    Returns a summary dict.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown format: {fmt}')
+    size = os.path.getsize(source)
+    if fmt == 'binary' and size % 8:
+        raise ValueError(f'{source} is not a whole number of int64 values')
+    progress = progress or (lambda event: None)
+
+    chunk_items = max(1, memory // (ITEM_BYTES + EXTRA_ITEM_BYTES[fmt]))
+    fan_in = max(2, min(MAX_FAN_IN, memory // MIN_BUFFER_BYTES - 1))
+    # One buffer per input run plus one for the output
+    buffer_items = max(1, memory // 8 // (fan_in + 1))
+
+    with tempfile.TemporaryDirectory(prefix='sort-runs-', dir=directory) as work:
+        runs = []
+        items = 0
+        with open(source, 'rb') as f:
+            for chunk in _read_chunks(f, fmt, chunk_items):
+                chunk.sort()
+                path = os.path.join(work, f'run-0-{len(runs)}')
+                with open(path, 'wb') as out:
+                    _write(out, chunk, 'binary', buffer_items, native=True)
+                runs.append(path)
+                items += len(chunk)
+                progress({
+                    'phase': 'run', 'run': len(runs) - 1, 'items': len(chunk),
+                    'min': chunk[0], 'max': chunk[-1], 'fraction': f.tell() / size if size else 1.0,
+                })
+                del chunk
+
+        initial_runs = len(runs)
+        passes = 0
+        # Merge groups of runs until a single pass can produce the output
+        while len(runs) > fan_in:
+            passes += 1
+            merged = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                path = os.path.join(work, f'run-{passes}-{len(merged)}')
+                with open(path, 'wb') as out:
+                    count = _merge(group, out, 'binary', buffer_items, native=True)
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+                progress({'phase': 'merge', 'pass': passes, 'runs': len(group), 'items': count})
+            runs = merged
+
+        passes += 1
+        with open(dest, 'wb') as out:
+            count = _merge(runs, out, fmt, buffer_items)
+        progress({'phase': 'merge', 'pass': passes, 'runs': len(runs), 'items': count})
+
+    return {'items': items, 'runs': initial_runs, 'passes': passes, 'chunk_items': chunk_items, 'fan_in': fan_in}
+
+
+def parse_bytes(text):
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    text = text.strip().upper().rstrip('B')
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sort a file of integers larger than memory.')
+    parser.add_argument('source')
+    parser.add_argument('dest')
+    parser.add_argument('--format', choices=FORMATS, default='binary')
+    parser.add_argument('--memory', type=parse_bytes, default='64M', help='memory budget, e.g. 512M or 2G')
+    parser.add_argument('--tmp', help='directory for run files (default: the system temp directory)')
+    parser.add_argument('--progress', action='store_true', help='print progress events to stderr as JSON lines')
+    args = parser.parse_args(argv)
+
+    progress = (lambda event: print(json.dumps(event), file=sys.stderr)) if args.progress else None
+    result = external_sort(args.source, args.dest, args.format, args.memory, args.tmp, progress)
+    json.dump(result, sys.stdout)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
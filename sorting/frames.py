@@ -0,0 +1,150 @@
+import io
+import struct
+
+import numpy as np
+
+from sorting.trace import SWAP, WRITE
+
+MAGIC = b'SRTF'
+VERSION = 1
+# magic, version, value dtype, index dtype, n, frames, writes, keyframe interval
+HEADER = struct.Struct('<4sH2s2sQQQQ')
+# Store every frame as a row when the whole matrix fits in this many bytes
+MAX_MATRIX_BYTES = 16 * 1024 * 1024
+
+
+def _dtype_for(values):
+    if len(values) == 0 or (values.min() >= 0 and values.max() < 2**16):
+        return np.dtype('<u2')
+    if values.min() >= 0 and values.max() < 2**32:
+        return np.dtype('<u4')
+    return np.dtype('<i8')
+
+
+def _aligned(offset):
+    return (offset + 7) & ~7
+
+
+def apply_writes(arr, index, value):
+    """Apply writes in order with one vectorized assignment (last write to an index wins)."""
+    if len(index) == 0:
+        return arr
+    last, first = np.unique(index[::-1], return_index=True)
+    arr[last] = value[::-1][first]
+    return arr
+
+
+class FrameStore:
+    """Frames of a Trace held in contiguous NumPy arrays.
+
+    Mutations are flattened to (index, value) writes.  Every
+    ``interval``-th frame is kept as a row of a 2-D keyframe matrix; with
+    small traces the interval is 1 and the matrix holds every frame.
+    Keyframes are returned as read-only views, other frames are rebuilt
+    from the nearest keyframe with at most ``interval`` frames of writes.
+    """
+
+    def __init__(self, keyframes, interval, frame_end, index, value):
+        self.keyframes = keyframes
+        self.interval = interval
+        self.frame_end = frame_end
+        self.index = index
+        self.value = value
+
+    @classmethod
+    def from_trace(cls, trace, interval=None):
+        n = len(trace.initial)
+        arr = list(trace.initial)
+        index, value = [], []
+        frame_end = np.empty(len(trace), dtype='<u8')
+        frame_end[0] = 0
+        ops, a, b = trace.ops, trace.a, trace.b
+        for k, t in enumerate(trace.steps, 1):
+            i, j = a[t], b[t]
+            if ops[t] == SWAP:
+                arr[i], arr[j] = arr[j], arr[i]
+                index += (i, j)
+                value += (arr[i], arr[j])
+            elif ops[t] == WRITE:
+                arr[i] = j
+                index.append(i)
+                value.append(j)
+            frame_end[k] = len(index)
+
+        initial = np.asarray(trace.initial, dtype=np.int64)
+        value_dtype = _dtype_for(np.concatenate([initial, np.asarray(value, dtype=np.int64)]))
+        index = np.asarray(index, dtype='<u2' if n < 2**16 else '<u4')
+        value = np.asarray(value, dtype=value_dtype)
+
+        frames = len(trace)
+        if interval is None:
+            if frames * n * value_dtype.itemsize <= MAX_MATRIX_BYTES:
+                interval = 1
+            else:
+                # Keep keyframes about as large as the write log itself
+                interval = max(1, -(-frames * n // max(len(index), 1)))
+        keyframes = np.empty((-(-frames // interval), n), dtype=value_dtype)
+        current = initial.astype(value_dtype)
+        keyframes[0] = current
+        for key in range(1, len(keyframes)):
+            start, end = frame_end[(key - 1) * interval], frame_end[key * interval]
+            keyframes[key] = apply_writes(current, index[start:end], value[start:end])
+        return cls(keyframes, interval, frame_end, index, value)
+
+    def __len__(self):
+        return len(self.frame_end)
+
+    @property
+    def n(self):
+        return self.keyframes.shape[1]
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.keyframes, self.frame_end, self.index, self.value))
+
+    def frame(self, k):
+        k = max(0, min(k, len(self) - 1))
+        key, offset = divmod(k, self.interval)
+        base = self.keyframes[key]
+        if offset == 0:
+            view = base.view()
+            view.flags.writeable = False
+            return view
+        start, end = self.frame_end[key * self.interval], self.frame_end[k]
+        return apply_writes(base.copy(), self.index[start:end], self.value[start:end])
+
+    def write(self, f):
+        header = HEADER.pack(MAGIC, VERSION, self.value.dtype.str[1:].encode(), self.index.dtype.str[1:].encode(),
+                             self.n, len(self), len(self.index), self.interval)
+        f.write(header)
+        offset = len(header)
+        for array in (self.frame_end, self.index, self.value, self.keyframes):
+            padding = _aligned(offset) - offset
+            f.write(b'\0' * padding)
+            f.write(np.ascontiguousarray(array).data)
+            offset += padding + array.nbytes
+        return offset
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        self.write(buffer)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Rebuild a FrameStore over ``buffer`` (bytes, memoryview or mmap) without copying."""
+        magic, version, value_code, index_code, n, frames, writes, interval = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not a sorting frame store')
+        value_dtype = np.dtype('<' + value_code.decode())
+        index_dtype = np.dtype('<' + index_code.decode())
+        offset = HEADER.size
+        keys = -(-frames // interval)
+        arrays = []
+        for dtype, count in (('<u8', frames), (index_dtype, writes), (value_dtype, writes), (value_dtype, keys * n)):
+            offset = _aligned(offset)
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+            arrays.append(array)
+            offset += array.nbytes
+        frame_end, index, value, keyframes = arrays
+        return cls(keyframes.reshape(keys, n), interval, frame_end, index, value)
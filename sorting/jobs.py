@@ -0,0 +1,102 @@
+import os
+import signal
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import diskcache
+import psutil
+
+from sorting.cache import cache_dir
+
+# Sorting jobs run inside Dash background-callback processes.  At most
+# MAX_JOBS of them sort at the same time across all workers, and each is
+# stopped after JOB_TIMEOUT seconds, counting the wait for a free slot.
+MAX_JOBS = int(os.environ.get('SORT_MAX_JOBS', os.cpu_count() or 1))
+JOB_TIMEOUT = float(os.environ.get('SORT_JOB_TIMEOUT', 20))
+# How often a job waiting for a slot looks again
+SLOT_POLL = 0.05
+
+_slots_cache = None
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def _slots():
+    global _slots_cache
+    if _slots_cache is None:
+        _slots_cache = diskcache.Cache(cache_dir('jobs'))
+    return _slots_cache
+
+
+def _acquire(timeout):
+    """Take a free slot, returning its key and the token that proves ownership.
+
+    Each slot is a key holding (pid, token) of the process using it.  Dash
+    cancels a job by killing its process, so a slot whose process is gone
+    is reclaimed; the lease also expires after twice ``timeout`` in case
+    the PID has been reused.
+    """
+    cache = _slots()
+    deadline = time.monotonic() + timeout
+    token = (os.getpid(), uuid.uuid4().hex)
+    while True:
+        for i in range(MAX_JOBS):
+            key = f'sort-job-{i}'
+            if cache.add(key, token, expire=timeout * 2):
+                return key, token
+            holder = cache.get(key)
+            if holder is not None and not psutil.pid_exists(holder[0]):
+                with cache.transact():
+                    # Only drop the lease we saw, not one another job has just taken
+                    if cache.get(key) == holder:
+                        cache.delete(key)
+        if time.monotonic() >= deadline:
+            raise JobTimeout(f'No free sorting job slot within {timeout:g} s')
+        time.sleep(SLOT_POLL)
+
+
+def _release(key, token):
+    cache = _slots()
+    with cache.transact():
+        if cache.get(key) == token:
+            cache.delete(key)
+
+
+@contextmanager
+def time_limit(seconds):
+    # SIGALRM can only be handled on the main thread, which is where
+    # background callbacks run; elsewhere the limit is not enforced.
+    if threading.current_thread() is not threading.main_thread() or not hasattr(signal, 'setitimer'):
+        yield
+        return
+
+    def expired(signum, frame):
+        raise JobTimeout(f'Sorting job exceeded {seconds:g} s')
+
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_job(fn, *args, timeout=JOB_TIMEOUT):
+    """Run ``fn(*args)`` holding a shared job slot, raising JobTimeout after ``timeout`` seconds.
+
+    The timeout covers waiting for the slot as well as the job itself.
+    Cancellation comes from Dash: when the triggering input changes, the
+    background-callback process running the old job is terminated, and
+    the next job to look at its slot reclaims it.
+    """
+    with time_limit(timeout):
+        key, token = _acquire(timeout)
+        try:
+            return fn(*args)
+        finally:
+            _release(key, token)
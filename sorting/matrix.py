@@ -0,0 +1,123 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sorting.algorithms import ALGORITHMS, source_hash
+from sorting.bench import budgeted_benchmark
+from sorting.cache import cache_dir
+from sorting.datasets import DISTRIBUTIONS, generate
+
+SIZES = (100, 1000, 5000)
+# A cell whose first run predicts more than this for all repeats is timed once
+CELL_BUDGET_NS = 2 * 10**9
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    algorithm TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    distribution TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    repeats INTEGER NOT NULL,
+    median_ns REAL NOT NULL,
+    q1_ns REAL NOT NULL,
+    q3_ns REAL NOT NULL,
+    min_ns REAL NOT NULL,
+    PRIMARY KEY (algorithm, source_hash, distribution, size, seed)
+)
+'''
+COLUMNS = ('algorithm', 'source_hash', 'distribution', 'size', 'seed', 'repeats', 'median_ns', 'q1_ns', 'q3_ns', 'min_ns')
+
+
+def connect(path=None):
+    db = sqlite3.connect(path or os.path.join(cache_dir(), 'matrix.sqlite'))
+    db.row_factory = sqlite3.Row
+    db.execute(SCHEMA)
+    return db
+
+
+def measure_cell(name, distribution, size, seed=0, repeats=5):
+    """Benchmark one (algorithm, distribution, size) cell.  Runs in a worker process."""
+    result = budgeted_benchmark(name, generate(distribution, size, seed), repeats, CELL_BUDGET_NS)
+    result.update(algorithm=name, source_hash=source_hash(name), distribution=distribution, seed=seed)
+    return result
+
+
+def run_matrix(algorithms=None, sizes=SIZES, distributions=DISTRIBUTIONS, seed=0, repeats=5,
+               max_workers=None, path=None, progress=None):
+    """Fill in every missing cell of the algorithm x size x distribution grid.
+
+    Cells are keyed by the algorithm's source hash, so only algorithms that
+    changed since the last run are measured again; rows for their old
+    source are dropped.  Each cell is committed as soon as it finishes, so
+    an interrupted run keeps its progress.  ``progress`` is called with
+    (done, total) after every cell.  Returns the number of cells measured.
+    """
+    names = list(algorithms or ALGORITHMS)
+    hashes = {name: source_hash(name) for name in names}
+    db = connect(path)
+    try:
+        with db:
+            for name, digest in hashes.items():
+                db.execute('DELETE FROM results WHERE algorithm = ? AND source_hash != ?', (name, digest))
+        done = {
+            (row['algorithm'], row['distribution'], row['size'])
+            for row in db.execute('SELECT algorithm, distribution, size FROM results WHERE seed = ?', (seed,))
+        }
+        cells = [
+            (name, distribution, size)
+            for name in names for distribution in distributions for size in sizes
+            if (name, distribution, size) not in done
+        ]
+        if not cells:
+            return 0
+        workers = max_workers or min(len(cells), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(measure_cell, name, distribution, size, seed, repeats) for name, distribution, size in cells]
+            for finished, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                with db:
+                    db.execute(
+                        f'INSERT OR REPLACE INTO results ({", ".join(COLUMNS)}) VALUES ({", ".join("?" * len(COLUMNS))})',
+                        [row[column] for column in COLUMNS],
+                    )
+                if progress:
+                    progress(finished, len(cells))
+        return len(cells)
+    finally:
+        db.close()
+
+
+def load_matrix(seed=0, path=None):
+    """Stored results for the current source of every registered algorithm."""
+    hashes = {name: source_hash(name) for name in ALGORITHMS}
+    db = connect(path)
+    try:
+        rows = db.execute('SELECT * FROM results WHERE seed = ? ORDER BY algorithm, distribution, size', (seed,))
+        return [dict(row) for row in rows if hashes.get(row['algorithm']) == row['source_hash']]
+    finally:
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fill the benchmark matrix and print the stored results as JSON.')
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(SIZES))
+    parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--db', help='SQLite file (default: matrix.sqlite in the cache directory)')
+    args = parser.parse_args(argv)
+
+    progress = lambda done, total: print(f'{done}/{total} cells', file=sys.stderr)
+    run_matrix(args.algorithms, args.sizes, args.distributions, args.seed, args.repeats, args.workers, args.db, progress)
+    json.dump(load_matrix(args.seed, args.db), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
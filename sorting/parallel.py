@@ -0,0 +1,97 @@
+import heapq
+import itertools
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from sorting.algorithms import merge_sort, record
+from sorting.trace import TraceTooLong
+
+# With fewer items than this per worker, starting the chunks costs more than
+# sorting them; only used when the worker count is picked automatically
+MIN_CHUNK = 10000
+
+_pools = {}
+
+
+def _pool(workers):
+    # Pools are kept per size so repeated (benchmarked) sorts in one process do
+    # not pay for process start-up; close_pools() shuts them down
+    pool = _pools.get(workers)
+    if pool is None:
+        pool = _pools[workers] = ProcessPoolExecutor(workers)
+    return pool
+
+
+def close_pools():
+    while _pools:
+        _, pool = _pools.popitem()
+        pool.shutdown()
+
+
+def _sort_chunk(name, lo, hi):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with shm.buf.cast('q') as view:
+            chunk = merge_sort(view[lo:hi].tolist())
+            view[lo:hi] = array('q', chunk)
+    finally:
+        shm.close()
+
+
+def parallel_merge_sort(arr, probe=None, workers=None):
+    """Sort ``arr`` in place by merge-sorting chunks in ``workers`` processes.
+
+    The values live in one shared int64 buffer: each worker sorts its slice
+    in place and the parent k-way merges straight out of it, so no chunk is
+    pickled in either direction.  The work happens in other processes, so
+    it cannot be traced.
+    """
+    if probe is not None:
+        raise ValueError('parallel_merge_sort cannot be traced')
+    n = len(arr)
+    if workers is None:
+        workers = min(os.cpu_count() or 1, n // MIN_CHUNK)
+    workers = min(workers, n)
+    if workers <= 1:
+        return merge_sort(arr)
+
+    bounds = [n * i // workers for i in range(workers + 1)]
+    shm = shared_memory.SharedMemory(create=True, size=n * 8)
+    try:
+        with shm.buf.cast('q') as view:
+            view[:n] = array('q', arr)
+            pool = _pool(workers)
+            for future in [pool.submit(_sort_chunk, shm.name, lo, hi) for lo, hi in zip(bounds, bounds[1:])]:
+                future.result()
+            runs = [view[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+            try:
+                arr[:] = heapq.merge(*runs)
+            finally:
+                for run in runs:
+                    run.release()
+    finally:
+        shm.close()
+        shm.unlink()
+    return arr
+
+
+def _record_within(algorithm, data, max_ops):
+    try:
+        return record(algorithm, data, max_ops)
+    except TraceTooLong:
+        return None
+
+
+def record_all(algorithms, data, max_ops=None):
+    """Record a Trace of each algorithm on ``data``, one process per algorithm.
+
+    Algorithms that exceed ``max_ops`` operations give None instead of a
+    Trace.  The pool lives only for this call: callers are short-lived
+    background jobs, where a kept pool would never be reused.
+    """
+    if len(algorithms) <= 1:
+        return [_record_within(algorithm, data, max_ops) for algorithm in algorithms]
+    with ProcessPoolExecutor(len(algorithms)) as pool:
+        return list(pool.map(_record_within, algorithms, itertools.repeat(data), itertools.repeat(max_ops)))
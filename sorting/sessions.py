@@ -0,0 +1,58 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class SessionRegistry:
+    """Per-session values with idle TTL, LRU eviction and a memory cap.
+
+    Each session holds one value together with the key it was computed
+    for; asking for a different key replaces it.  Values must be
+    reproducible from the key, so a worker that never saw the session can
+    rebuild it.
+    """
+
+    def __init__(self, ttl=30 * 60, max_sessions=1000, max_bytes=32 * 1024 * 1024, sizeof=lambda value: value.nbytes):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, session_id, key, compute):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.get(session_id)
+            if entry is not None and entry[0] == key:
+                self._sessions[session_id] = (key, entry[1], entry[2], now)
+                self._sessions.move_to_end(session_id)
+                return entry[1]
+
+        value = compute()
+        nbytes = self.sizeof(value)
+        with self._lock:
+            self._discard(session_id)
+            self._sessions[session_id] = (key, value, nbytes, now)
+            self.nbytes += nbytes
+            while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions or self.nbytes > self.max_bytes):
+                self._discard(next(iter(self._sessions)))
+        return value
+
+    def _discard(self, session_id):
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+
+    def _expire(self, now):
+        # Entries are kept in last-access order, so expired ones are at the front
+        while self._sessions:
+            session_id, entry = next(iter(self._sessions.items()))
+            if now - entry[3] < self.ttl:
+                break
+            self._discard(session_id)
@@ -0,0 +1,51 @@
+import json
+import math
+import time
+
+# Browsers do not repaint faster than this, so higher frame rates are sent as
+# several frames per event instead of more events
+MAX_EVENT_RATE = 30
+
+
+def sse(data, event=None, id=None):
+    """Encode one Server-Sent Event."""
+    lines = []
+    if event:
+        lines.append(f'event: {event}')
+    if id is not None:
+        lines.append(f'id: {id}')
+    lines.append(f'data: {json.dumps(data, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def frame_events(frames, fps=30, start=0):
+    """Stream a FrameStore as SSE deltas played at ``fps`` frames per second.
+
+    The first event carries the array at frame ``start``, looked up from
+    the nearest keyframe, so a resumed stream does not replay the trace
+    from the beginning.  Every later event carries the (index, value)
+    writes of the next batch of frames and is paced on a monotonic clock.
+    Writing blocks while the client is slow to read, and the server closes
+    the generator once the client disconnects, so an abandoned stream
+    stops producing frames.
+    """
+    count = len(frames)
+    start = max(0, min(start, count - 1))
+    yield sse({'initial': frames.frame(start).tolist(), 'frame': start, 'frames': count}, event='init', id=start)
+
+    batch = math.ceil(fps / MAX_EVENT_RATE)
+    period = batch / fps
+    frame_end, index, value = frames.frame_end, frames.index, frames.value
+    deadline = time.monotonic()
+    for k in range(start, count - 1, batch):
+        end = min(k + batch, count - 1)
+        deadline += period
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # Behind schedule (slow client): restart the clock rather than burst to catch up
+            deadline = time.monotonic()
+        lo, hi = frame_end[k], frame_end[end]
+        yield sse({'frame': end, 'writes': list(zip(index[lo:hi].tolist(), value[lo:hi].tolist()))}, id=end)
+    yield sse({'frame': count - 1}, event='end', id=count - 1)
@@ -0,0 +1,145 @@
+from array import array
+from itertools import accumulate
+
+# Operation codes stored in Trace.ops
+COMPARE, SWAP, WRITE = 0, 1, 2
+# Cost of each op on the race clock: comparisons plus writes, a swap being two writes
+OP_COST = (1, 2, 1)
+
+
+class TraceTooLong(Exception):
+    pass
+
+
+class OpCounter:
+    """Probe that only counts operations, for when frames are not needed."""
+
+    def __init__(self):
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+        self.allocations = 0
+        self.allocated = 0
+
+    def compare(self, i, j):
+        self.comparisons += 1
+
+    def swap(self, i, j):
+        self.swaps += 1
+
+    def write(self, i, value):
+        self.writes += 1
+
+    def alloc(self, size):
+        self.allocations += 1
+        self.allocated += size
+
+
+class Trace:
+    """Operation log recorded while an algorithm sorts a list in place.
+
+    Only the initial array and the operations are kept; frames are rebuilt
+    on demand by replaying mutations, so memory grows with the number of
+    operations instead of operations x n.  Frame 0 is the input and frame k
+    is the array after the k-th swap or write.  With ``max_ops`` set,
+    recording stops with TraceTooLong once the log holds that many
+    operations, which bounds the memory a quadratic sort can take.
+    """
+
+    def __init__(self, data, max_ops=None):
+        self.max_ops = max_ops if max_ops is not None else float('inf')
+        self.initial = array('q', data)
+        self.ops = array('B')
+        self.a = array('q')
+        self.b = array('q')
+        # index into ops of every mutating operation, one per frame after 0
+        self.steps = array('q')
+        # auxiliary buffers the algorithm reported, and their total length
+        self.allocations = 0
+        self.allocated = 0
+
+    def compare(self, i, j):
+        # Every sort compares before it mutates, so checking here is enough
+        if len(self.ops) >= self.max_ops:
+            raise TraceTooLong(f'Trace exceeded {self.max_ops:,} operations')
+        self.ops.append(COMPARE)
+        self.a.append(i)
+        self.b.append(j)
+
+    def swap(self, i, j):
+        self.steps.append(len(self.ops))
+        self.ops.append(SWAP)
+        self.a.append(i)
+        self.b.append(j)
+
+    def write(self, i, value):
+        self.steps.append(len(self.ops))
+        self.ops.append(WRITE)
+        self.a.append(i)
+        self.b.append(value)
+
+    def alloc(self, size):
+        self.allocations += 1
+        self.allocated += size
+
+    def __len__(self):
+        return len(self.steps) + 1
+
+    @property
+    def comparisons(self):
+        return self.ops.count(COMPARE)
+
+    @property
+    def swaps(self):
+        return self.ops.count(SWAP)
+
+    @property
+    def writes(self):
+        return self.ops.count(WRITE)
+
+    @property
+    def nbytes(self):
+        return sum(buf.itemsize * len(buf) for buf in (self.initial, self.ops, self.a, self.b, self.steps))
+
+    @staticmethod
+    def _apply(arr, op, i, j):
+        if op == SWAP:
+            arr[i], arr[j] = arr[j], arr[i]
+        elif op == WRITE:
+            arr[i] = j
+
+    def frame(self, k):
+        k = max(0, min(k, len(self) - 1))
+        arr = list(self.initial)
+        end = self.steps[k - 1] + 1 if k else 0
+        ops, a, b = self.ops, self.a, self.b
+        for t in range(end):
+            self._apply(arr, ops[t], a[t], b[t])
+        return arr
+
+    def cost_clock(self):
+        """Cumulative cost when each frame after 0 is reached, and the total cost of the run."""
+        spent = list(accumulate(OP_COST[op] for op in self.ops))
+        return [spent[t] for t in self.steps], spent[-1] if spent else 0
+
+    def to_dict(self):
+        # Only mutations are needed to play the trace back in the browser
+        steps = self.steps
+        return {
+            'initial': self.initial.tolist(),
+            'ops': [self.ops[t] for t in steps],
+            'a': [self.a[t] for t in steps],
+            'b': [self.b[t] for t in steps],
+        }
+
+    def to_frames(self, interval=None):
+        from sorting.frames import FrameStore
+        return FrameStore.from_trace(self, interval)
+
+    def frames(self):
+        arr = list(self.initial)
+        yield list(arr)
+        ops, a, b = self.ops, self.a, self.b
+        for t in self.steps:
+            self._apply(arr, ops[t], a[t], b[t])
+            yield list(arr)
@@ -0,0 +1,94 @@
+import hashlib
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sorting.cache import cache_dir
+from sorting.frames import FrameStore
+
+
+class TraceStore:
+    """Frame stores written once to disk and read back through mmap.
+
+    Files use the FrameStore layout (header, write log, periodic
+    keyframes), so any frame is one keyframe copy plus at most
+    ``keyframe_interval`` frames of writes.  By default FrameStore picks
+    the interval, keeping the keyframes about as large as the write log
+    whatever the array size.  Pages come from the OS page cache, which
+    every worker process mapping the same file shares.
+    Files unused for ``max_age`` seconds, or the least recently used ones
+    beyond ``max_bytes``, are deleted by collect().
+    """
+
+    def __init__(self, directory=None, keyframe_interval=None, max_bytes=2 * 1024**3, max_age=24 * 60 * 60, max_open=64):
+        self.directory = directory or cache_dir('traces')
+        self.keyframe_interval = keyframe_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_open = max_open
+        self._open = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f'{digest}.frames')
+
+    def get(self, key, compute):
+        """Return the FrameStore for ``key``, writing ``compute()``'s Trace to disk on a miss."""
+        path = self.path(key)
+        with self._lock:
+            entry = self._open.get(path)
+            if entry is not None:
+                self._open.move_to_end(path)
+                return entry[1]
+
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except FileNotFoundError:
+            frames = compute().to_frames(self.keyframe_interval)
+            tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp, 'w+b') as f:
+                frames.write(f)
+                f.flush()
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.replace(tmp, path)
+            self.collect(keep=path)
+
+        frames = FrameStore.from_buffer(mapped)
+        with self._lock:
+            self._open[path] = (mapped, frames)
+            while len(self._open) > self.max_open:
+                # The mapping is released once no FrameStore view refers to it
+                self._open.popitem(last=False)
+        return frames
+
+    def collect(self, keep=None):
+        now = time.time()
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.frames') or entry.path == keep:
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime > self.max_age:
+                self._remove(entry.path)
+            else:
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        # Processes that still map the file keep their pages until they unmap it
+        with self._lock:
+            self._open.pop(path, None)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
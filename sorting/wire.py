@@ -0,0 +1,46 @@
+import base64
+import json
+import sys
+from array import array
+
+# Typed arrays understood by the decoder in assets/playback.js, smallest first:
+# (name, array typecode, min, max)
+DTYPES = (
+    ('u1', 'B', 0, 2**8 - 1),
+    ('u2', 'H', 0, 2**16 - 1),
+    ('u4', 'I', 0, 2**32 - 1),
+    ('i4', 'i', -2**31, 2**31 - 1),
+)
+# Trace payload fields that hold integer lists
+ARRAY_FIELDS = ('initial', 'ops', 'a', 'b', 'cost')
+
+
+def encode_array(values):
+    """Pack integers into the smallest little-endian typed array that holds them, as base64."""
+    lo, hi = (min(values), max(values)) if len(values) else (0, 0)
+    for name, typecode, low, high in DTYPES:
+        if low <= lo and hi <= high:
+            break
+    else:
+        # Out of int32 range; JavaScript numbers are doubles anyway
+        name, typecode = 'f8', 'd'
+    packed = array(typecode, values)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return {'dtype': name, 'data': base64.b64encode(packed.tobytes()).decode('ascii')}
+
+
+def encode_payload(payload):
+    """Copy of a trace payload with its integer lists sent as typed arrays."""
+    if payload is None:
+        return None
+    encoded = dict(payload, binary=True)
+    for field in ARRAY_FIELDS:
+        if field in payload:
+            encoded[field] = encode_array(payload[field])
+    return encoded
+
+
+def json_size(payload):
+    """Size in bytes of ``payload`` as compact JSON, roughly what a callback response carries."""
+    return len(json.dumps(payload, separators=(',', ':')))